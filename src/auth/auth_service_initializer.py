@@ -2,12 +2,16 @@ from types import TracebackType
 from typing import Optional, Type
 
 from fastapi import FastAPI
+from redis.asyncio import BlockingConnectionPool, Redis
 from sqlalchemy.ext.asyncio import AsyncEngine
+from src.base.config import Config, ConfigInvalidValueError
 from src.base.initializer import State, Initializer
 
 # local imports
 from src.auth.database.repository.account import AccountRepository
 from src.auth.database.repository.jwt_token import JWTRepository
+from src.auth.util.jwt_settings import JwtSettings
+from src.auth.util.token_revocation import TokenRevocationCache
 
 
 class ServiceState(State):
@@ -16,11 +20,14 @@ class ServiceState(State):
     account_repository: AccountRepository
     jwt_repository: JWTRepository
     # utilities
-    
+    jwt_settings: JwtSettings
+    token_revocation_cache: TokenRevocationCache
+
 
 class AuthServiceInitializer(Initializer):
-    def __init__(self, app: FastAPI) -> None:
-        super().__init__(app=app)
+    def __init__(self, app: FastAPI, config: Optional[Config] = None) -> None:
+        super().__init__(app=app, config=config)
+        self.token_revocation_cache: Optional[TokenRevocationCache] = None
 
     async def __aenter__(self) -> ServiceState:
         state = await super().__aenter__()
@@ -29,10 +36,31 @@ class AuthServiceInitializer(Initializer):
         db_engine = self.engine_factory.create_engine("DB")
 
         # Initialize utilities
+        jwt_settings = JwtSettings.from_config(self.config)
+        jwt_delete_batch_size = self.config.get_int("JWT_DELETE_BATCH_SIZE", 1000)
+        if jwt_delete_batch_size <= 0:
+            raise ConfigInvalidValueError(
+                f"value of JWT_DELETE_BATCH_SIZE must be positive: '{jwt_delete_batch_size}'"
+            )
+        # every authenticated request checks the denylist, so on a burst of requests the pool
+        # waits for a free connection (up to the timeout) instead of failing right away
+        self.token_revocation_cache = TokenRevocationCache(
+            redis=Redis.from_pool(
+                BlockingConnectionPool(
+                    host=self.config.require_config("REDIS_HOST"),
+                    port=self.config.require_int("REDIS_PORT"),
+                    max_connections=self.config.get_int("REDIS_MAX_CONNECTIONS", 100),
+                    timeout=self.config.get_float("REDIS_POOL_TIMEOUT", 5.0),
+                )
+            )
+        )
 
         # Initialize repositories
         account_repository = AccountRepository(engine=db_engine)
-        jwt_repository = JWTRepository(engine=db_engine)
+        jwt_repository = JWTRepository(
+            engine=db_engine,
+            delete_batch_size=jwt_delete_batch_size,
+        )
 
         # Initialize services/tools
         
@@ -41,9 +69,13 @@ class AuthServiceInitializer(Initializer):
             db_engine=db_engine,
             account_repository=account_repository,
             jwt_repository=jwt_repository,
+            jwt_settings=jwt_settings,
+            token_revocation_cache=self.token_revocation_cache,
         )
 
     async def __aexit__(
         self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[TracebackType]
     ) -> None:
+        if self.token_revocation_cache:
+            await self.token_revocation_cache.close()
         await super().__aexit__(exc_type, exc_val, exc_tb)
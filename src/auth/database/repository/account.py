@@ -1,11 +1,13 @@
-from uuid import UUID
 from typing import Sequence
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, true
 from sqlalchemy.exc import IntegrityError
 
+from src.base.exception.repository.base import NotFoundException
+
 # local imports
 from src.auth.database.model.account import Account
+from src.auth.database.model.jwt_token import JWTToken
 from src.auth.database.repository.base import BaseRepository
 
 
@@ -30,19 +32,42 @@ class AccountRepository(BaseRepository[Account]):
 
         return result
     
-    async def delete(self, entity_id: int) -> None:
+    async def delete_with_tokens(self, entity_id: int) -> Sequence[str]:
         """
-        Delete single entity in database
+        Delete single entity together with its JWT entities in a single statement
 
         :param entity_id: int of the entity to be deleted
         :type entity_id: int
+        :raises NotFoundException: If entity with specified int does not exist
+        :return: Access tokens of the deleted JWT entities
+        :rtype: Sequence[str]
         """
-        # fetch entry to be deleted
-        entry = await self.get_one(entity_id=entity_id)
+        # both deletes are data-modifying CTEs of one statement, so the account and
+        # its tokens go away in a single round trip and the token values are still
+        # returned for revocation
+        deleted_account = (
+            delete(self._model)
+            .where(self._model.id==entity_id)
+            .returning(self._model.id)
+            .cte("deleted_account")
+        )
+        deleted_tokens = (
+            delete(JWTToken)
+            .where(JWTToken.account_id==entity_id)
+            .returning(JWTToken.access_token)
+            .cte("deleted_tokens")
+        )
+        statement = select(deleted_account.c.id, deleted_tokens.c.access_token).select_from(
+            deleted_account.outerjoin(deleted_tokens, true())
+        )
         async with self._get_session() as session:
             try:
-                # delete the entry
-                await session.delete(entry)
+                rows = (await session.execute(statement)).all()
                 await session.commit()
             except IntegrityError as error:
-                self._parse_sql_error(error)
\ No newline at end of file
+                self._parse_sql_error(error)
+
+        if not rows:
+            raise NotFoundException(key_name="int", table_name=self._model.__tablename__, entity_id=entity_id)
+
+        return [row.access_token for row in rows if row.access_token is not None]
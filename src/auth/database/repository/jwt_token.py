@@ -1,11 +1,9 @@
-from datetime import datetime, timezone
-from typing import Sequence, Dict, Any
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Sequence
 
-from sqlalchemy import delete, update, select
+from sqlalchemy import delete, select
 from sqlalchemy.exc import IntegrityError
 
-from src.base.exception.repository.base import NotUniqueException, NotFoundException
-
 # local imports
 from src.auth.database.model.jwt_token import JWTToken
 from src.auth.database.repository.base import BaseRepository
@@ -13,69 +11,64 @@ from src.auth.database.repository.base import BaseRepository
 
 class JWTRepository(BaseRepository[JWTToken]):
     
-    def __init__(self, engine):
+    # pause between delete batches, lets other queries on the table interleave
+    _DELETE_BATCH_DELAY = 0.05
+
+    def __init__(self, engine, delete_batch_size: int = 1000):
         super().__init__(engine, JWTToken)
+        self._delete_batch_size = delete_batch_size
     
-    async def get_by_token_value(self, token_value: str) -> JWTToken:
-        """
-        Get entity from the database which have a 'access_token' field with
-        specified value. Method call will also ensure that only single entity
-        with this value exists in repository.
-        
-        :param token_value: User entity UUID to filter with
-        :type token_value: UUID
-        :return: Token entity
-        :rtype: JWTToken
+    async def delete_by_account_id(
+        self,
+        account_id: int,
+        before_delete: Optional[Callable[[Sequence[str]], Awaitable[None]]] = None,
+    ) -> Sequence[str]:
         """
-        async with self._get_session() as session:
-            query = select(self._model).where(self._model.access_token == token_value)
-            scalars = await session.scalars(query)
-            result = scalars.unique().all()
-
-        if len(result) == 0:
-            raise NotFoundException(key_name="access_token", entity_id=token_value, table_name=self._model.__tablename__)
-        elif len(result) != 1:
-            raise NotUniqueException()
+        Delete all entities in database that match 'account_id' field. Entities are
+        deleted in batches, each committed separately, so an account with many tokens
+        does not hold locks on the table for the duration of one huge delete.
 
-        return result[0]
-
-    async def update_by_account_id(self, account_id: int, values: Dict[str, Any]) -> Sequence[JWTToken]:
-        """
-        Update all entities from the database which have a reference (foreign key)
-        to specified account ID entity.
-        
-        :param account_id: Account entity int to filter with
+        :param account_id: int of the account_id field
         :type account_id: int
-        :param values: Values/fields to be updated
-        :type values: Dict[str, Any]
-        :return: List of entities (rows)
-        :rtype: Sequence[JWTToken]
+        :param before_delete: Called with access tokens of each batch before the batch is
+            deleted, if it raises the batch and the remaining entities are kept
+        :type before_delete: Optional[Callable[[Sequence[str]], Awaitable[None]]]
+        :return: Access tokens of the deleted entities
+        :rtype: Sequence[str]
         """
-        async with self._get_session() as session:
-            values = {**values, "updated_at": datetime.now(timezone.utc)}
-            query = update(self._model).where(self._model.account_id == account_id).values(values).returning(self._model.id)
+        batch = (
+            select(JWTToken.id, JWTToken.access_token)
+            .where(JWTToken.account_id == account_id)
+            .limit(self._delete_batch_size)
+        )
 
-            try:
-                scalars = await session.scalars(query)
-                result = scalars.unique().all()
+        result: List[str] = []
+        async with self._get_session() as session:
+            while True:
+                rows = (await session.execute(batch)).all()
+                # no transaction is kept open while waiting for before_delete
                 await session.commit()
-            except IntegrityError as error:
-                self._parse_sql_error(error)
+                if not rows:
+                    break
 
-        # TODO: Triển khai hàm get_multiple_by_ids để tránh gọi nhiều lần hàm get_one
-        return await self.get_multiple(result)
-    
-    async def delete_by_account_id(self, account_id: int) -> None:
-        """
-        Delete all entities in database that match 'account_id' field
+                if before_delete is not None:
+                    await before_delete([row.access_token for row in rows])
 
-        :param account_id: int of the account_id field
-        :type account_id: int
-        """
-        async with self._get_session() as session:
-            statements = delete(JWTToken).where(JWTToken.account_id == account_id)
-            await session.execute(statements)
-            try:
-                await session.commit()
-            except IntegrityError as error:
-                self._parse_sql_error(error)
\ No newline at end of file
+                statements = (
+                    delete(JWTToken)
+                    .where(JWTToken.id.in_([row.id for row in rows]))
+                    .returning(JWTToken.access_token)
+                )
+                try:
+                    scalars = await session.scalars(statements)
+                    result.extend(scalars.all())
+                    await session.commit()
+                except IntegrityError as error:
+                    self._parse_sql_error(error)
+
+                # a partial batch means there is nothing left to delete
+                if len(rows) < self._delete_batch_size:
+                    break
+                await asyncio.sleep(self._DELETE_BATCH_DELAY)
+
+        return result
@@ -0,0 +1,15 @@
+from typing import Annotated
+
+from src.base.dependency_injection import Injects
+
+# local imports
+from src.auth.database.repository.account import AccountRepository
+from src.auth.database.repository.jwt_token import JWTRepository
+from src.auth.util.jwt_settings import JwtSettings
+from src.auth.util.token_revocation import TokenRevocationCache
+
+# Dependencies defined in ServiceState, declared once so that endpoints share them
+AccountRepositoryDep = Annotated[AccountRepository, Injects("account_repository")]
+JWTRepositoryDep = Annotated[JWTRepository, Injects("jwt_repository")]
+JwtSettingsDep = Annotated[JwtSettings, Injects("jwt_settings")]
+TokenRevocationCacheDep = Annotated[TokenRevocationCache, Injects("token_revocation_cache")]
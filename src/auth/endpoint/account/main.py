@@ -1,13 +1,11 @@
 from fastapi import APIRouter, Security
 
-from src.base.dependency_injection import Injects
 from src.base.exception.repository.base import NotUniqueException
 
 # local imports
-from src.auth.util.main import authenticate, get_password_hash
+from src.auth.util.main import authenticate, get_password_hash, revoke_access_tokens, revoke_account_tokens
 from src.auth.doc import Tags
-from src.auth.database.repository.account import AccountRepository
-from src.auth.database.repository.jwt_token import JWTRepository
+from src.auth.dependency_injection import AccountRepositoryDep, JWTRepositoryDep, TokenRevocationCacheDep
 from src.auth.dto.account import AccountRequest, AccountResponse
 from src.auth.exception.api.account_exception import AnalyzerException, AccountBadRequestException, AccountEmailRegistered, AccountNotFoundException, AccountUnAuthorizedException
 
@@ -26,9 +24,9 @@ router = APIRouter(tags=[Tags.ACCOUNT], prefix="/v1/account")
 )
 async def add_account(
     request: AccountRequest,
-    account_repository: AccountRepository = Injects("account_repository"),
+    account_repository: AccountRepositoryDep,
 ) -> AccountResponse:
-    pass_hash = get_password_hash(request.password)
+    pass_hash = await get_password_hash(request.password)
     try:
         account_entity = await account_repository.create(
             values={
@@ -41,7 +39,7 @@ async def add_account(
     except NotUniqueException:
         raise AccountEmailRegistered()
 
-    return AccountResponse(
+    return AccountResponse.model_construct(
         id=account_entity.id,
         organization_name=account_entity.organization_name,
         email=account_entity.email,
@@ -61,12 +59,12 @@ async def add_account(
     },
 )
 async def get_account(
+    account_repository: AccountRepositoryDep,
     account_id: int = Security(authenticate),
-    account_repository: AccountRepository = Injects("account_repository"),
 ) -> AccountResponse:
     account_entity = await account_repository.get_one(entity_id=account_id)
 
-    return AccountResponse(
+    return AccountResponse.model_construct(
         id=account_entity.id,
         organization_name=account_entity.organization_name,
         email=account_entity.email,
@@ -88,8 +86,8 @@ async def get_account(
 )
 async def update_account(
     request: AccountRequest,
+    account_repository: AccountRepositoryDep,
     account_id: int = Security(authenticate),
-    account_repository: AccountRepository = Injects("account_repository"),
 ) -> AccountResponse:
     account_entity = await account_repository.update(
         entity_id=account_id,
@@ -100,7 +98,7 @@ async def update_account(
         }
     )
 
-    return AccountResponse(
+    return AccountResponse.model_construct(
         id=account_entity.id,
         organization_name=account_entity.organization_name,
         email=account_entity.email,
@@ -120,12 +118,18 @@ async def update_account(
     },
 )
 async def delete_account(
+    account_repository: AccountRepositoryDep,
+    jwt_repository: JWTRepositoryDep,
+    token_revocation_cache: TokenRevocationCacheDep,
     account_id: int = Security(authenticate),
-    account_repository: AccountRepository = Injects("account_repository"),
-    jwt_repository: JWTRepository = Injects("jwt_repository"),
 ) -> None:
-    # Delete keys and invalidate access
-    await jwt_repository.delete_by_account_id(account_id=account_id)
-    
-    # Delete the actual user entity
-    return await account_repository.delete(entity_id=account_id)
+    # Invalidate access and delete the keys in batches first, so a failure leaves them to a retry
+    await revoke_account_tokens(
+        account_id=account_id,
+        jwt_repository=jwt_repository,
+        token_revocation_cache=token_revocation_cache,
+    )
+
+    # Delete the user entity together with the keys stored in the meantime
+    access_tokens = await account_repository.delete_with_tokens(entity_id=account_id)
+    await revoke_access_tokens(access_tokens=access_tokens, token_revocation_cache=token_revocation_cache)
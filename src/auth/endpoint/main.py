@@ -1,8 +1,7 @@
-from fastapi import APIRouter
-
 from src.auth.endpoint.account.main import router as router_account
 from src.auth.endpoint.token.main import router as router_token
 
-main_router = APIRouter(prefix="/api")
-main_router.include_router(router_account)
-main_router.include_router(router_token)
+# Routers are included in the app directly (with "/api" prefix) rather than through an
+# aggregating router, which would build every route once more at startup
+ROUTERS_PREFIX = "/api"
+routers = (router_account, router_token)
@@ -3,18 +3,17 @@ from typing import Annotated
 from fastapi import APIRouter, Security, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 
-from src.base.dependency_injection import Injects
 from src.base.exception.repository.base import NotFoundException
 
 # local imports
-from src.base.config import Config
 from src.auth.util.main import (
-    authenticate, password_hash_match, 
+    authenticate, password_hash_match, revoke_account_tokens,
     create_access_token, create_refresh_token, verify_token
 )
 from src.auth.doc import Tags
-from src.auth.database.repository.jwt_token import JWTRepository
-from src.auth.database.repository.account import AccountRepository 
+from src.auth.dependency_injection import (
+    AccountRepositoryDep, JWTRepositoryDep, JwtSettingsDep, TokenRevocationCacheDep
+)
 from src.auth.dto.token import AccessTokenResponse, RefreshTokenRequest
 from src.auth.exception.api.account_exception import(
     AnalyzerException, AccountBadRequestException, AccountNotFoundException, AccountUnAuthorizedException
@@ -38,9 +37,10 @@ router = APIRouter(tags=[Tags.ACCOUNT], prefix="/v1/account/authentication")
 )
 async def generate_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    account_repository: AccountRepository = Injects("account_repository"),
-    jwt_repository: JWTRepository = Injects("jwt_repository"),
-    config: Config = Injects("config")
+    account_repository: AccountRepositoryDep,
+    jwt_repository: JWTRepositoryDep,
+    token_revocation_cache: TokenRevocationCacheDep,
+    jwt_settings: JwtSettingsDep,
 ) -> AccessTokenResponse:
     try:
         account_entities = await account_repository.get_by_email(email=form_data.username)
@@ -55,20 +55,24 @@ async def generate_token(
     else:
         account_entity = account_entities[0]
 
-    if not password_hash_match(form_data.password, account_entity.hashed_password):
+    if not await password_hash_match(form_data.password, account_entity.hashed_password):
         raise AccountUnAuthorizedException()
     
     # NOTE: only one device can be logged in at any given time because we
     # clear the repository for the account per each login
-    await jwt_repository.delete_by_account_id(account_id=account_entity.id)
+    await revoke_account_tokens(
+        account_id=account_entity.id,
+        jwt_repository=jwt_repository,
+        token_revocation_cache=token_revocation_cache,
+    )
     
     access_token = create_access_token(
         data={"sub": str(account_entity.id)}, 
-        config=config
+        jwt_settings=jwt_settings
     )
     refresh_token = create_refresh_token(
         data={"sub": str(account_entity.id)},
-        config=config
+        jwt_settings=jwt_settings
     )
 
     jwt_entity = await jwt_repository.create(
@@ -79,7 +83,7 @@ async def generate_token(
         }
     )
 
-    return AccessTokenResponse(
+    return AccessTokenResponse.model_construct(
         access_token=jwt_entity.access_token,
         refresh_token=jwt_entity.refresh_token,
     )
@@ -98,11 +102,12 @@ async def generate_token(
 )
 async def refresh_token(
     request: RefreshTokenRequest,
+    jwt_repository: JWTRepositoryDep,
+    token_revocation_cache: TokenRevocationCacheDep,
+    jwt_settings: JwtSettingsDep,
     authenticated_account_id: int = Security(authenticate),
-    jwt_repository: JWTRepository = Injects("jwt_repository"),
-    config: Config = Injects("config")
 ) -> AccessTokenResponse:
-    account_id = verify_token(token=request.refresh_token, type="refresh", config=config)
+    account_id = verify_token(token=request.refresh_token, type="refresh", jwt_settings=jwt_settings)
     if authenticated_account_id != account_id:
         raise AccountUnAuthorizedException()
 
@@ -110,27 +115,32 @@ async def refresh_token(
     # that account ID is valid and not corrupted - we don't need to fetch account model again
 
     access_token = create_access_token(
-        data={"sub": str(account_id)}, config=config
+        data={"sub": str(account_id)}, jwt_settings=jwt_settings
     )
     refresh_token = create_refresh_token(
-        data={"sub": str(account_id)}, config=config
+        data={"sub": str(account_id)}, jwt_settings=jwt_settings
     )
 
-    jwt_entities = await jwt_repository.update_by_account_id(
+    # replace the previous tokens and revoke the access token they were holding
+    access_tokens = await revoke_account_tokens(
         account_id=account_id,
+        jwt_repository=jwt_repository,
+        token_revocation_cache=token_revocation_cache,
+    )
+
+    if len(access_tokens) != 1:
+        # there cannot be more than one JWT entity per account!
+        raise AnalyzerException()  # FIXME: make this custom exception
+
+    jwt_entity = await jwt_repository.create(
         values={
+            "account_id": account_id,
             "access_token": access_token,
             "refresh_token": refresh_token,
         }
     )
 
-    if len(jwt_entities) != 1:
-        # there cannot be more than one JWT entity per account!
-        raise AnalyzerException()  # FIXME: make this custom exception
-    else:
-        jwt_entity = jwt_entities[0]
-
-    return AccessTokenResponse(
+    return AccessTokenResponse.model_construct(
         access_token=jwt_entity.access_token,
         refresh_token=jwt_entity.refresh_token,
     )
@@ -148,8 +158,13 @@ async def refresh_token(
     },
 )
 async def terminate_token(
+    jwt_repository: JWTRepositoryDep,
+    token_revocation_cache: TokenRevocationCacheDep,
     account_id: int = Security(authenticate),
-    jwt_repository: JWTRepository = Injects("jwt_repository")
 ) -> None:
-    await jwt_repository.delete_by_account_id(account_id=account_id)
+    await revoke_account_tokens(
+        account_id=account_id,
+        jwt_repository=jwt_repository,
+        token_revocation_cache=token_revocation_cache,
+    )
 # endregion: token
\ No newline at end of file
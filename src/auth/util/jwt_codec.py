@@ -0,0 +1,141 @@
+import base64
+import hashlib
+import hmac
+from time import time
+from typing import Any, Callable, Dict
+
+import orjson
+
+# HMAC based algorithms, signing is done by hashlib/hmac (OpenSSL) without
+# the per call overhead of a generic JWT library
+_DIGESTS: Dict[str, Callable[..., Any]] = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+class InvalidTokenError(Exception):
+    pass
+
+
+def _b64encode(value: bytes) -> bytes:
+    return base64.urlsafe_b64encode(value).rstrip(b"=")
+
+
+def _b64decode(value: bytes) -> bytes:
+    decoded = base64.urlsafe_b64decode(value + b"=" * (-len(value) % 4))
+    # base64 module ignores padding and characters outside of the alphabet, so the same
+    # token could be spelled in many ways - only the spelling produced by us is accepted
+    if _b64encode(decoded) != value:
+        raise ValueError("non-canonical base64 segment")
+
+    return decoded
+
+
+# Header only depends on the algorithm, so it is serialized once per algorithm
+# (same bytes as PyJWT produced, tokens issued by it remain valid)
+_HEADER_SEGMENTS: Dict[str, bytes] = {
+    algorithm: _b64encode(orjson.dumps({"alg": algorithm, "typ": "JWT"})) for algorithm in _DIGESTS
+}
+
+
+def is_supported_algorithm(algorithm: str) -> bool:
+    return algorithm in _DIGESTS
+
+
+def signing_key(secret: bytes, algorithm: str) -> hmac.HMAC:
+    """
+    Prepare signing key for `encode` and `decode`. The secret is processed into the
+    HMAC state only once, each token is then signed by a copy of it.
+
+    :param secret: Secret key to sign the tokens with
+    :type secret: bytes
+    :param algorithm: Signing algorithm (HS256, HS384 or HS512)
+    :type algorithm: str
+    :return: Keyed HMAC to be used as a template
+    :rtype: hmac.HMAC
+    """
+    return hmac.new(secret, digestmod=_DIGESTS[algorithm])
+
+
+def _sign(key: hmac.HMAC, signing_input: bytes) -> bytes:
+    signer = key.copy()
+    signer.update(signing_input)
+    return signer.digest()
+
+
+def encode(payload: Dict[str, Any], key: hmac.HMAC, algorithm: str) -> str:
+    """
+    Encode payload into signed JWT
+
+    :param payload: JSON serializable claims, 'exp' must be a timestamp
+    :type payload: Dict[str, Any]
+    :param key: Signing key created by `signing_key`
+    :type key: hmac.HMAC
+    :param algorithm: Signing algorithm (HS256, HS384 or HS512), must match the key
+    :type algorithm: str
+    :return: JWT token
+    :rtype: str
+    """
+    signing_input = _HEADER_SEGMENTS[algorithm] + b"." + _b64encode(orjson.dumps(payload))
+    signature = _sign(key, signing_input)
+
+    return (signing_input + b"." + _b64encode(signature)).decode()
+
+
+def decode(token: str, key: hmac.HMAC, algorithm: str) -> Dict[str, Any]:
+    """
+    Verify JWT signature and expiry and return its payload
+
+    :param token: JWT token
+    :type token: str
+    :param key: Signing key created by `signing_key`
+    :type key: hmac.HMAC
+    :param algorithm: Expected signing algorithm, must match the key
+    :type algorithm: str
+    :raises InvalidTokenError: If token is malformed, forged or expired
+    :return: Token payload
+    :rtype: Dict[str, Any]
+    """
+    try:
+        header_segment, payload_segment, signature_segment = token.encode().split(b".")
+        signing_input = header_segment + b"." + payload_segment
+
+        # we only accept tokens issued by us, so header must match byte by byte
+        if header_segment != _HEADER_SEGMENTS[algorithm]:
+            raise InvalidTokenError("algorithm_not_allowed")
+
+        signature = _sign(key, signing_input)
+        if not hmac.compare_digest(signature, _b64decode(signature_segment)):
+            raise InvalidTokenError("signature_verification_failed")
+
+        payload = orjson.loads(_b64decode(payload_segment))
+    except (ValueError, TypeError) as error:  # unpacking, binascii and JSON errors are ValueErrors
+        raise InvalidTokenError("token_malformed") from error
+
+    if not isinstance(payload, dict):
+        raise InvalidTokenError("token_malformed")
+
+    expiry = payload.get("exp")
+    if expiry is not None and (not isinstance(expiry, (int, float)) or expiry <= time()):
+        raise InvalidTokenError("token_expired")
+
+    return payload
+
+
+def get_unverified_payload(token: str) -> Dict[str, Any]:
+    """
+    Return JWT payload without verifying the token. Must be used only for tokens
+    that come from a trusted source (e.g. our own repository).
+
+    :param token: JWT token
+    :type token: str
+    :raises InvalidTokenError: If token is malformed
+    :return: Token payload
+    :rtype: Dict[str, Any]
+    """
+    try:
+        return orjson.loads(_b64decode(token.encode().split(b".")[1]))
+    except (ValueError, IndexError) as error:
+        raise InvalidTokenError("token_malformed") from error
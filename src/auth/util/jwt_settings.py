@@ -0,0 +1,31 @@
+import hmac
+from dataclasses import dataclass
+
+from src.base.config import Config, ConfigInvalidValueError
+
+# Local imports
+from src.auth.util.jwt_codec import is_supported_algorithm, signing_key
+
+
+@dataclass(frozen=True, slots=True)
+class JwtSettings:
+    """
+    JWT signing configuration. It is resolved from the config once at service startup,
+    so token helpers do not look it up on every call.
+    """
+
+    access_signing_key: hmac.HMAC
+    refresh_signing_key: hmac.HMAC
+    algorithm: str
+
+    @classmethod
+    def from_config(cls, config: Config) -> "JwtSettings":
+        algorithm = config.require_config("ALGORITHM")
+        if not is_supported_algorithm(algorithm):
+            raise ConfigInvalidValueError(f"value of ALGORITHM is not supported: '{algorithm}'")
+
+        return cls(
+            access_signing_key=signing_key(config.require_config("ACCESS_SECRET_KEY").encode(), algorithm),
+            refresh_signing_key=signing_key(config.require_config("REFRESH_SECRET_KEY").encode(), algorithm),
+            algorithm=algorithm,
+        )
@@ -1,72 +1,146 @@
+import asyncio
+import hmac
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from functools import partial
+from hashlib import blake2b, sha256
+from secrets import token_bytes, token_hex
+from time import time
+from typing import Optional, Sequence
 
-from jwt import encode, decode
-from jwt.exceptions import InvalidTokenError
+from cachetools import TTLCache
 from fastapi import Depends
-from fastapi.security import (
-    OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
-)
+from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
 
-from src.base.config import Config
-from src.base.dependency_injection import Injects
-from src.base.exception.repository.base import NotFoundException
-
 # Local imports
 from src.auth.database.repository.jwt_token import JWTRepository
+from src.auth.dependency_injection import JwtSettingsDep, TokenRevocationCacheDep
+from src.auth.util.jwt_codec import InvalidTokenError, encode, decode, get_unverified_payload
+from src.auth.util.jwt_settings import JwtSettings
+from src.auth.util.token_revocation import TokenRevocationCache
 from src.auth.exception.api.account_exception import AccountUnAuthorizedException
 
-http_bearer_scheme = HTTPBearer(auto_error=False)
+# reads the bearer token from the 'Authorization' header (parsed once per request)
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="api/v1/account/authentication/generate_token",
     refreshUrl="api/v1/account/authentication/refresh_token",
     auto_error=False
 )
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# existing hashes keep verifying with the rounds they were created with
+pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=10, deprecated="auto")
 
+# Validated access tokens: token digest -> (account ID, expiry timestamp). Lets
+# repeated requests with the same token skip the JWT decode.
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
 
-async def authenticate(
-    # Token xác thực sau sẽ ghi đè lên token trước nếu cả hai cùng được cung cấp 
-    oauth_token: Optional[str] = Depends(oauth2_scheme),
-    http_credential: Optional[HTTPAuthorizationCredentials] = Depends(http_bearer_scheme),
-    jwt_repository: JWTRepository = Injects("jwt_repository"),
-    config: Config = Injects("config")
-) -> int:
-    
-    token = None
+# Recent password verifications: keyed digest of (hash, password) -> match. Lets quick
+# login retries skip the bcrypt verify. The key is peppered with a per-process secret,
+# so neither password nor hash can be recovered or tested against the cache.
+_password_match_pepper = token_bytes(32)
+_password_match_cache: TTLCache = TTLCache(maxsize=1024, ttl=5)
 
-    # Ưu tiên HTTP Bearer token
-    if http_credential:
-        token = http_credential.credentials
-    elif oauth_token:
-        token = oauth_token
 
+async def authenticate(
+    token_revocation_cache: TokenRevocationCacheDep,
+    jwt_settings: JwtSettingsDep,
+    token: Optional[str] = Depends(oauth2_scheme),
+) -> int:
     if token:
-        # check that token has not been invalidated (removed from repository)
-        try:
-            await jwt_repository.get_by_token_value(token_value=token)
-        except NotFoundException:
+        key = _token_cache_key(token)
+        cached = _token_cache.get(key)
+        if cached is not None and cached[1] > time():
+            account_id = cached[0]
+        else:
+            payload = _decode_token(token=token, jwt_settings=jwt_settings)
+            account_id = int(payload["sub"])
+            _token_cache[key] = (account_id, payload.get("exp", 0))
+
+        # check that token has not been invalidated (logout, new login, etc.), only
+        # verified tokens are checked, so the denylist key is the one we revoked
+        if await token_revocation_cache.is_revoked(token=token):
             raise AccountUnAuthorizedException()
-        
-        return verify_token(token=token, config=config)
+
+        return account_id
     
     # If no authentication method hit then un-authorized
     raise AccountUnAuthorizedException()
 
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def revoke_access_tokens(
+    access_tokens: Sequence[str],
+    token_revocation_cache: TokenRevocationCache,
+) -> None:
+    """
+    Revoke access tokens until they expire. Should be called before the tokens are
+    removed from the repository, so that a failure leaves them to a retry.
+
+    :param access_tokens: Access token values to be revoked
+    :type access_tokens: Sequence[str]
+    :param token_revocation_cache: Denylist to add the tokens to
+    :type token_revocation_cache: TokenRevocationCache
+    """
+    now = int(time())
+    # tokens come from our repository, signature is verified on use
+    await token_revocation_cache.revoke_many(
+        (access_token, int(get_unverified_payload(access_token).get("exp", 0)) - now)
+        for access_token in access_tokens
+    )
+
+
+async def revoke_account_tokens(
+    account_id: int,
+    jwt_repository: JWTRepository,
+    token_revocation_cache: TokenRevocationCache,
+) -> Sequence[str]:
+    """
+    Revoke access tokens of the account and delete its JWT entities. Tokens are revoked
+    before their entities are deleted, so if revoking fails they are still in the
+    repository and a retry revokes them.
+
+    :param account_id: Account whose tokens are revoked
+    :type account_id: int
+    :param jwt_repository: Repository holding the JWT entities
+    :type jwt_repository: JWTRepository
+    :param token_revocation_cache: Denylist to add the tokens to
+    :type token_revocation_cache: TokenRevocationCache
+    :return: Access tokens of the deleted entities
+    :rtype: Sequence[str]
+    """
+    # each batch is revoked before it is deleted, so the work stays bounded by the batch size
+    return await jwt_repository.delete_by_account_id(
+        account_id=account_id,
+        before_delete=partial(revoke_access_tokens, token_revocation_cache=token_revocation_cache),
+    )
+
+
+def _token_cache_key(token: str) -> bytes:
+    # raw tokens are never kept in memory, only their digest
+    return blake2b(token.encode(), digest_size=16).digest()
 
 
-def password_hash_match(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+# bcrypt is CPU bound, run it in worker thread to not block the event loop
+async def get_password_hash(password: str) -> str:
+    return await asyncio.to_thread(pwd_context.hash, password)
+
+
+async def password_hash_match(plain_password: str, hashed_password: str) -> bool:
+    key = hmac.new(
+        _password_match_pepper,
+        hashed_password.encode() + b"\0" + plain_password.encode(),
+        sha256,
+    ).digest()
+    matched = _password_match_cache.get(key)
+    if matched is None:
+        matched = await asyncio.to_thread(pwd_context.verify, plain_password, hashed_password)
+        _password_match_cache[key] = matched
+
+    return matched
 
 
 def create_access_token(
     data: dict, 
-    config: Config,
+    jwt_settings: JwtSettings,
     expires_delta: timedelta | None = None,
 ) -> str:
     to_encode = data.copy()
@@ -74,18 +148,20 @@ def create_access_token(
         expire = datetime.now(timezone.utc) + expires_delta
     else:  # default expiry is 30 minutes
         expire = datetime.now(timezone.utc) + timedelta(minutes=30)
-    to_encode.update({"exp": expire})
+    # unique token ID keeps tokens issued within the same second apart,
+    # otherwise a fresh token could match an already revoked one
+    to_encode.update({"exp": int(expire.timestamp()), "jti": token_hex(8)})
     encoded_jwt = encode(
         to_encode, 
-        config.require_config("ACCESS_SECRET_KEY"), 
-        algorithm=config.require_config("ALGORITHM")
+        jwt_settings.access_signing_key, 
+        algorithm=jwt_settings.algorithm
     )
     return encoded_jwt
 
 
 def create_refresh_token(
     data: dict, 
-    config: Config,
+    jwt_settings: JwtSettings,
     expires_delta: timedelta | None = None,
 ) -> str:
     """
@@ -101,31 +177,39 @@ def create_refresh_token(
         expire = datetime.now(timezone.utc) + expires_delta
     else:  # default expiry is 60 minutes
         expire = datetime.now(timezone.utc) + timedelta(minutes=60)  # FIXME: expiry must be longer here because we don't generate new refresh tokens - this single token will be used to refresh access token until it expiry in whcih case we force the user to login again
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": int(expire.timestamp()), "jti": token_hex(8)})
     encoded_jwt = encode(
         to_encode, 
-        config.require_config("REFRESH_SECRET_KEY"), 
-        algorithm=config.require_config("ALGORITHM")
+        jwt_settings.refresh_signing_key, 
+        algorithm=jwt_settings.algorithm
     )
     return encoded_jwt
 
 
 def verify_token(
     token: str,
-    config: Config,
+    jwt_settings: JwtSettings,
     type: str = "access",
 ) -> int:
+    payload = _decode_token(token=token, jwt_settings=jwt_settings, type=type)
+    return int(payload["sub"])
+
+
+def _decode_token(
+    token: str,
+    jwt_settings: JwtSettings,
+    type: str = "access",
+) -> dict:
     try:
         if type == "access":
-            secret_key = config.require_config("ACCESS_SECRET_KEY")
+            signing_key = jwt_settings.access_signing_key
         else:
-            secret_key = config.require_config("REFRESH_SECRET_KEY")
+            signing_key = jwt_settings.refresh_signing_key
 
-        payload: dict = decode(token, secret_key, algorithms=[config.require_config("ALGORITHM")])
-        account_id = payload.get("sub")
-        if account_id is None:
+        payload = decode(token, signing_key, jwt_settings.algorithm)
+        if payload.get("sub") is None:
             raise AccountUnAuthorizedException()
     except InvalidTokenError:
         raise AccountUnAuthorizedException()
 
-    return int(account_id)
+    return payload
@@ -1,3 +1,4 @@
+from functools import partial
 from typing import Type, Any
 from typing_extensions import Annotated, Doc
 
@@ -6,7 +7,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from src.base.middleware.global_exception import GlobalExceptionMiddleware
 from src.base.exception.api.base import HTTPException
-from src.base.exception.api.handler import rest_exception_handler
+from src.base.exception.api.handler import rest_exception_handler, value_error_handler
 from src.base.endpoint.docs import router as router_docs
 from src.base.endpoint.health import router as router_health
 from src.base.initializer import Initializer
@@ -65,13 +66,16 @@ def create_fastapi_app(
 
     app = FastAPI(
         redoc_url=None,
-        lifespan=initializer,
+        lifespan=partial(initializer, config=config), # Initializer shares the app config
         title=title,
         description=description,
         version=version,
         summary=summary,
         contact={"name": team_name, "url": team_url},
-        exception_handlers={HTTPException: rest_exception_handler}, # Handle business logic exceptions
+        exception_handlers={
+            HTTPException: rest_exception_handler, # Handle business logic exceptions
+            ValueError: value_error_handler, # Handle invalid values
+        },
         swagger_ui_parameters={
             "defaultModelsExpandDepth": -1,  # collapse/remove schemas by default in swagger UI
         },
@@ -4,10 +4,11 @@ from typing import Any, AsyncIterator, Optional, Sequence, Type, TypeVar, Generi
 
 from pydantic.alias_generators import to_snake
 
-from sqlalchemy import insert, select, update, func, text
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy import Executable, Select, insert, select, update, func, text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
-from sqlalchemy.engine import Result, RowMapping, CursorResult
+from sqlalchemy.engine import RowMapping, CursorResult
+from sqlalchemy.sql.base import ExecutableOption
 
 from src.base.database.model.base import Base
 from src.base.exception.repository.base import NotFoundException
@@ -38,36 +39,67 @@ class Repository(ABC, Generic[T]):
         finally:
             await session.close()
 
-    async def get_all(self) -> Sequence[T]:
+    @staticmethod
+    def _apply_load(query: Select, load: Sequence[ExecutableOption]) -> Select:
+        """
+        Apply relationship loader options to the query, so relationships accessed on the
+        returned entities are loaded eagerly instead of by a lazy query per entity. Use
+        `selectinload` for collections (one extra IN query) and `joinedload` for
+        many-to-one relationships (single JOIN):
+
+        >>> await repository.get_one(entity_id, load=[selectinload(Model.children)])
+        """
+        return query.options(*load) if load else query
+
+    async def _execute_scalar(self, statement: Executable) -> Any:
+        """
+        Execute single statement on a plain connection (committed on success) and return
+        the first column of the first row. It skips the session machinery (identity map,
+        unit of work), so it must only be used for statements that do not load entities.
+
+        :param statement: Statement to be executed
+        :type statement: Executable
+        :return: First column of the first row or None if there are no rows
+        :rtype: Any
+        """
+        async with self._engine.begin() as connection:
+            result = await connection.execute(statement)
+            return result.scalar()
+
+    async def get_all(self, *, load: Sequence[ExecutableOption] = ()) -> Sequence[T]:
         """
         Fetch all entities from the database. Method uses generic type T which will be made specific
         when specific repository is implemented.
 
+        :param load: Relationship loader options (e.g. selectinload), see `_apply_load`
+        :type load: Sequence[ExecutableOption]
         :return: List of entities (rows)
         :rtype: Sequence[T]
         """
         async with self._get_session() as session:
-            query = select(self._model)
+            query = self._apply_load(select(self._model), load)
             scalars = await session.scalars(query)
-            result = scalars.all()
+            result = (scalars.unique() if load else scalars).all()
 
         return result
 
-    async def get_one(self, entity_id: int) -> T:
+    async def get_one(self, entity_id: int, *, load: Sequence[ExecutableOption] = ()) -> T:
         """
         Fetch single entity from database. Method uses generic type T which will be made specific
         when specific repository is implemented.
 
         :param entity_id: Entity int to filter with
         :type entity_id: int
+        :param load: Relationship loader options (e.g. selectinload), see `_apply_load`
+        :type load: Sequence[ExecutableOption]
         :raises NotFoundException: If entity with specified int does not exist
         :return: Entity (row)
         :rtype: T
         """
         async with self._get_session() as session:
-            query = select(self._model).where(self._model.id == entity_id)
+            query = self._apply_load(select(self._model).where(self._model.id == entity_id), load)
             scalars = await session.scalars(query)
-            result: Optional[T] = scalars.first()
+            result: Optional[T] = (scalars.unique() if load else scalars).first()
             
             if result is None:
                 raise NotFoundException(key_name="int", table_name=self._model.__tablename__, entity_id=entity_id)
@@ -75,7 +107,13 @@ class Repository(ABC, Generic[T]):
         return result
     
 
-    async def get_multiple(self, skip: Optional[int] = 0, limit: Optional[int] = 20) -> tuple[Sequence[T], int]:
+    async def get_multiple(
+        self,
+        skip: Optional[int] = 0,
+        limit: Optional[int] = 20,
+        *,
+        load: Sequence[ExecutableOption] = (),
+    ) -> tuple[Sequence[T], int]:
         """
         Fetch paginated entities with total count. Method uses generic type T
         which will be made specific when specific repository is implemented.
@@ -84,16 +122,15 @@ class Repository(ABC, Generic[T]):
         :type skip: int
         :param limit: Maximum number of records to return
         :type limit: Optional[int]
+        :param load: Relationship loader options (e.g. selectinload), see `_apply_load`
+        :type load: Sequence[ExecutableOption]
         :return: Tuple of (records, total_count)
         :rtype: tuple[Sequence[T], int]
         """
         async with self._get_session() as session:
-            # Count total records
-            count_query = select(func.count()).select_from(self._model)
-            total = (await session.scalar(count_query)) or 0
-
-            # Select records with pagination
-            query = select(self._model)
+            # Select records with pagination, total count is computed over the whole
+            # table by window function so that both come back in a single query
+            query = self._apply_load(select(self._model, func.count().over().label("total")), load)
 
             # Apply pagination
             if skip:
@@ -101,8 +138,18 @@ class Repository(ABC, Generic[T]):
             if limit:
                 query = query.limit(limit)
 
-            scalars = await session.scalars(query)
-            result = scalars.all()
+            result_rows = await session.execute(query)
+            rows = (result_rows.unique() if load else result_rows).all()
+            result = [row[0] for row in rows]
+
+        if rows:
+            total = rows[0].total
+        elif skip:
+            # page is past the end of the table - window function has no rows to count over
+            count_query = select(func.count()).select_from(self._model)
+            total = (await self._execute_scalar(count_query)) or 0
+        else:
+            total = 0
 
         return result, total
 
@@ -116,20 +163,22 @@ class Repository(ABC, Generic[T]):
         :return: Inserted entity
         :rtype: T
         """
-        async with self._get_session() as session:
-            query = insert(self._model).values(values).returning(self._model.id)
-            result: Optional[int]
+        # entity is returned by the INSERT itself, so it must stay loaded after commit
+        async with self._get_session(expire_on_commit=False) as session:
+            query = insert(self._model).values(values).returning(self._model)
+            result: Optional[T]
 
             try:
-                result = await session.scalar(query)
+                scalars = await session.scalars(query)
+                result = scalars.first()
                 await session.commit()
             except IntegrityError as error:
                 self._parse_sql_error(error)
         
         if result is None:
-            raise ValueError("Insert failed, no ID returned")
+            raise ValueError("Insert failed, no entity returned")
         
-        return await self.get_one(result)
+        return result
 
     async def update(self, entity_id: int, values: dict[str, Any]) -> T:
         """
@@ -143,17 +192,22 @@ class Repository(ABC, Generic[T]):
         :return: Updated entity
         :rtype: T
         """
-        async with self._get_session() as session:
+        async with self._get_session(expire_on_commit=False) as session:
             values = {**values}
-            query = update(self._model).where(self._model.id == entity_id).values(values).returning(self._model.id)
+            query = update(self._model).where(self._model.id == entity_id).values(values).returning(self._model)
+            result: Optional[T]
 
             try:
-                result = await session.scalar(query)
+                scalars = await session.scalars(query)
+                result = scalars.first()
                 await session.commit()
             except IntegrityError as error:
                 self._parse_sql_error(error)
 
-        return await self.get_one(result) # type: ignore
+        if result is None:
+            raise NotFoundException(key_name="int", table_name=self._model.__tablename__, entity_id=entity_id)
+
+        return result
     
     async def execute_sql(
         self,
@@ -1,4 +1,5 @@
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable
 
 from fastapi import Request, params
 from starlette import datastructures
@@ -26,10 +27,18 @@ def Injects(  # noqa: N802
         ),
     ] = True,
 ) -> Any:
+    return params.Depends(dependency=_state_getter(dependency), use_cache=use_cache)
+
+
+@lru_cache(maxsize=None)
+def _state_getter(dependency: str) -> Callable[[Request], Any]:
+    # FastAPI caches dependency values per request by their callable, so the getter is
+    # created once per name, and the same name injected in several places of one
+    # request (e.g. security dependency and endpoint) is resolved only once
     def _inject_from_state(request: Request) -> Any:
         return getattr(request.state, dependency)
 
-    return params.Depends(dependency=_inject_from_state, use_cache=use_cache)
+    return _inject_from_state
 
 
 def InjectState(  # noqa: N802
@@ -4,7 +4,7 @@ from typing import Dict, Optional, Type
 from uuid import uuid4
 
 from asyncpg import Connection # type: ignore[import]
-from sqlalchemy import NullPool
+from sqlalchemy import AsyncAdaptedQueuePool, NullPool
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from src.base.config import Config
@@ -22,6 +22,12 @@ class EngineFactory:
         <<database_identifier>>_USER
         <<database_identifier>>_PASSWORD
 
+    Connection pooling is disabled by default (see `_create_no_pool_engine`). When the
+    database is reached directly rather than through pgbouncer, a pooled engine can be
+    enabled with the following optional environment variables:
+        <<database_identifier>>_POOL_SIZE
+        <<database_identifier>>_MAX_OVERFLOW
+
     Where <<database_identifier>> is the prefix to uniquely indentify the engine you want to create.
     This factory is already context managed by FastAPIInitializer, so it can be used straight away:
 
@@ -67,17 +73,24 @@ class EngineFactory:
     def create_engine(self, database_identifier: str) -> AsyncEngine:
         with self._engine_init_lock:
             if database_identifier not in self._engines:
-                self._engines[database_identifier] = self._create_no_pool_engine(database_identifier.upper())
+                identifier = database_identifier.upper()
+                if self._config.get_int(f"{identifier}_POOL_SIZE", 0) > 0:
+                    self._engines[database_identifier] = self._create_pool_engine(identifier)
+                else:
+                    self._engines[database_identifier] = self._create_no_pool_engine(identifier)
 
         return self._engines[database_identifier]
 
-    def _create_no_pool_engine(self, database_identifier: str) -> AsyncEngine:
+    def _get_url(self, database_identifier: str) -> str:
         db_host = self._config.require_config(f"{database_identifier}_HOST")
         db_port = self._config.require_config(f"{database_identifier}_PORT")
         db_name = self._config.require_config(f"{database_identifier}_NAME")
         db_user = self._config.require_config(f"{database_identifier}_USER")
         db_password = self._config.require_config(f"{database_identifier}_PASSWORD")
-        url = f"postgresql+asyncpg://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+        return f"postgresql+asyncpg://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+
+    def _create_no_pool_engine(self, database_identifier: str) -> AsyncEngine:
+        url = self._get_url(database_identifier)
 
         # Data-platform configure DBs in a way that services can't have connection pools,
         # since connections are closed and returned as soon as the query is completed.
@@ -96,6 +109,26 @@ class EngineFactory:
             },
         )
 
+    def _create_pool_engine(self, database_identifier: str) -> AsyncEngine:
+        url = self._get_url(database_identifier)
+
+        # Connections are kept open, so asyncpg can reuse prepared statements across
+        # requests instead of parsing and planning the same queries again. Pre-ping is
+        # disabled as it would cost an extra round trip per checkout.
+        return create_async_engine(
+            url=url,
+            echo=False,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=self._config.require_int(f"{database_identifier}_POOL_SIZE"),
+            max_overflow=self._config.get_int(f"{database_identifier}_MAX_OVERFLOW", 0),
+            pool_pre_ping=False,
+            connect_args={
+                "server_settings": {"application_name": "test"},
+                "statement_cache_size": 512,
+                "prepared_statement_cache_size": 512,
+            },
+        )
+
 
 # Necessary hack to handle data-platform no pooling configuration,
 # see https://github.com/sqlalchemy/sqlalchemy/issues/6467#issuecomment-864943824
@@ -1,8 +1,29 @@
+from functools import lru_cache
 from http import HTTPStatus
-from typing import Any, Dict, Type
+from typing import Any, Dict, Hashable, Optional, Tuple, Type
 
 from pydantic import BaseModel
-from starlette.responses import JSONResponse
+from starlette.types import Receive, Scope, Send
+
+
+class PrebuiltResponse:
+    """
+    Minimal ASGI JSON response for constant payloads (error responses). Headers are encoded
+    once, when the response is built, and the same instance can be sent any number of
+    times, so it is meant to be created once and reused.
+    """
+
+    __slots__ = ("_status", "_headers", "_body")
+
+    def __init__(self, status_code: int, body: bytes) -> None:
+        self._status = int(status_code)
+        self._headers = ((b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()))
+        self._body = body
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # messages are created per send, outer middleware (e.g. CORS) modifies the headers
+        await send({"type": "http.response.start", "status": self._status, "headers": list(self._headers)})
+        await send({"type": "http.response.body", "body": self._body})
 
 
 class RestException(BaseModel):
@@ -66,14 +87,21 @@ class HTTPException(Exception):
     def __init__(self, **payload_args: Any):
         assert hasattr(self, "status"), "http_status_not_defined"
         self.payload: BaseModel = self.model(**payload_args)
+        self._payload_key = _payload_key(payload_args)
 
-    def get_body(self) -> JSONResponse:
+    def get_body(self) -> PrebuiltResponse:
         """
-        Converts the exception into a JSONResponse that matches `model` definition.
+        Converts the exception into a JSON response that matches `model` definition. The
+        payload is serialized by pydantic directly, without the intermediate dict. Response
+        is built only once per exception class and payload arguments, as long as the
+        arguments are hashable.
 
-        :return: JSONResponse with the exception payload that will be returned to the client.
+        :return: Response with the exception payload that will be returned to the client.
         """
-        return JSONResponse(self.payload.dict(), status_code=self.status, headers=None)
+        if self._payload_key is not None:
+            return _cached_response(type(self), self._payload_key)
+
+        return PrebuiltResponse(self.status, self.payload.model_dump_json().encode())
 
     @classmethod
     def get_description(cls) -> Dict[int, Any]:
@@ -84,3 +112,21 @@ class HTTPException(Exception):
         :return: dictionary with the Pydantic model that describes the HTTPException.
         """
         return {cls.status.value: {"model": cls.model}}
+
+
+def _payload_key(payload_args: Dict[str, Any]) -> Optional[Tuple[Hashable, ...]]:
+    # value types are part of the key, as e.g. 1 and True are equal but serialize differently
+    key = tuple(sorted((name, type(value), value) for name, value in payload_args.items()))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+
+    return key
+
+
+# bounded, arguments can vary (e.g. details of validation errors)
+@lru_cache(maxsize=256)
+def _cached_response(exception_class: Type[HTTPException], payload_key: Tuple[Hashable, ...]) -> PrebuiltResponse:
+    payload = exception_class.model(**{name: value for name, _, value in payload_key})
+    return PrebuiltResponse(exception_class.status, payload.model_dump_json().encode())
@@ -1,15 +1,31 @@
-from typing import Any, Type, Union
+import logging
+from functools import lru_cache
+from http import HTTPStatus
+from typing import Any, Tuple, Type, Union
 
+import orjson
 from starlette.requests import Request
-from starlette.responses import Response
 
-from src.base.exception.api.base import HTTPException
+from src.base.exception.api.base import HTTPException, PrebuiltResponse
 
+# Error response is constant, so it is built only once
+_BAD_REQUEST_RESPONSE = PrebuiltResponse(
+    HTTPStatus.BAD_REQUEST.value, orjson.dumps({"errors": [HTTPStatus.BAD_REQUEST.phrase]})
+)
 
-async def rest_exception_handler(_: Request, exc: HTTPException) -> Response:
+logger = logging.getLogger(__name__)
+
+
+async def rest_exception_handler(_: Request, exc: HTTPException) -> PrebuiltResponse:
     return exc.get_body()
 
 
+async def value_error_handler(_: Request, exc: ValueError) -> PrebuiltResponse:
+    # traceback is formatted lazily, by the log handler
+    logger.error("bad_request_error", exc_info=exc)
+    return _BAD_REQUEST_RESPONSE
+
+
 def compose_exceptions(*exceptions: Type[HTTPException]) -> dict[Union[int, str], dict[str, Any]]:
     """
     Use this method to document the exceptions thrown by your APIRouter, for example:
@@ -23,9 +39,16 @@ def compose_exceptions(*exceptions: Type[HTTPException]) -> dict[Union[int, str]
     :param exceptions: list of exception that extend from HTTPException
     :return: dictionary description of exceptions according to FastAPI standards
     """
-    responses: dict = {}
-
-    for exception in exceptions:
-        responses.update(exception.get_description())
-
-    return responses
+    # routes get their own copy, the cached one must not be modified
+    return dict(_compose_exceptions(exceptions))
+
+
+@lru_cache(maxsize=None)
+def _compose_exceptions(exceptions: Tuple[Type[HTTPException], ...]) -> dict[Union[int, str], dict[str, Any]]:
+    # the same set of exceptions is usually documented on many routes, descriptions are
+    # merged in one expression (later exceptions override earlier ones with the same status)
+    return {
+        status: description
+        for exception in exceptions
+        for status, description in exception.get_description().items()
+    }
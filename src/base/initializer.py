@@ -6,6 +6,7 @@ from fastapi import FastAPI
 from src.base.middleware.global_exception import GlobalExceptionMiddleware
 from src.base.config import Config
 from src.base.engine_factory import EngineFactory
+from src.base.log import LogQueue
 
 
 class State(Mapping):
@@ -39,8 +40,11 @@ class Initializer:
         self.config: Config = config if config else Config()
         self._app = app
         self.engine_factory = EngineFactory(config=self.config)
+        self.log_queue = LogQueue()
 
     async def __aenter__(self) -> State:
+        await self.log_queue.__aenter__()
+
         state = State(
             config=self.config,
         )
@@ -63,6 +67,7 @@ class Initializer:
     ) -> None:
         # self.logger.info("service_shutting_down")
         await self.engine_factory.__aexit__(exc_type, exc_val, exc_tb)
+        await self.log_queue.__aexit__(exc_type, exc_val, exc_tb)
     
     def _setup_app(self) -> None:
         self._app.version = self.config.get_config("RELEASE", "")
@@ -0,0 +1,163 @@
+import logging
+import queue
+import sys
+import traceback
+from logging.handlers import QueueHandler, QueueListener
+from types import TracebackType
+from typing import Optional, Set, TextIO, Type
+
+# records waiting to be written, when it is full new records are dropped
+_QUEUE_SIZE = 10_000
+_STDERR_BUFFER_SIZE = 1 << 16
+
+
+class TracebackFormatter(logging.Formatter):
+    """
+    Formats exception tracebacks from the frames only (file, line number and function),
+    without reading source lines from disk as `traceback.print_exception` does.
+    """
+
+    def formatException(self, ei) -> str:  # noqa: N802
+        _, exc, tb = ei
+        if exc is None:
+            return super().formatException(ei)
+
+        return self._format_traceback(exc, tb, set())
+
+    def _format_traceback(self, exc: BaseException, tb: Optional[TracebackType], seen: Set[int]) -> str:
+        # exceptions can be chained into a cycle, each one is formatted only once
+        seen.add(id(exc))
+        lines = []
+        # chained exceptions go first, same as in the standard traceback
+        if exc.__cause__ is not None:
+            if id(exc.__cause__) not in seen:
+                lines.append(self._format_traceback(exc.__cause__, exc.__cause__.__traceback__, seen))
+                lines.append("\nThe above exception was the direct cause of the following exception:\n")
+        elif exc.__context__ is not None and not exc.__suppress_context__:
+            if id(exc.__context__) not in seen:
+                lines.append(self._format_traceback(exc.__context__, exc.__context__.__traceback__, seen))
+                lines.append("\nDuring handling of the above exception, another exception occurred:\n")
+
+        lines.append("Traceback (most recent call last):")
+        lines.extend(
+            f'  File "{frame.f_code.co_filename}", line {lineno}, in {frame.f_code.co_name}'
+            for frame, lineno in traceback.walk_tb(tb)
+        )
+        lines.extend(line.rstrip("\n") for line in traceback.format_exception_only(type(exc), exc))
+
+        return "\n".join(lines)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # QueueHandler formats the record (including traceback) before enqueuing it,
+        # so it could be pickled. Queue is in-process, so the formatting is left to
+        # the listener thread instead of the caller (event loop).
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # losing records under a flood of errors is preferred over blocking the event loop
+            pass
+
+
+class _BufferedStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that does not flush after every record, flushing is left to the listener.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            # unlike StreamHandler, RecursionError is not re-raised - it would stop the listener
+            self.handleError(record)
+
+
+class _FlushingQueueListener(QueueListener):
+    def handle(self, record: logging.LogRecord) -> None:
+        try:
+            super().handle(record)
+            # records are written out in batches - whenever the queue is drained
+            if self.queue.empty():
+                for handler in self.handlers:
+                    handler.flush()
+        except Exception:
+            # a failing record must not stop the listener thread, the queue would fill up
+            traceback.print_exc(file=sys.stderr)
+
+    def enqueue_sentinel(self) -> None:
+        # queue can be full, the listener must be stopped anyway - unless its thread is
+        # already gone, then nothing would make room for the sentinel
+        if self._thread is not None and self._thread.is_alive():
+            self.queue.put(self._sentinel)
+
+
+def _buffered_stderr() -> TextIO:
+    try:
+        return open(  # noqa: SIM115 - file descriptor is owned by sys.stderr
+            sys.stderr.fileno(),
+            "w",
+            buffering=_STDERR_BUFFER_SIZE,
+            encoding=sys.stderr.encoding,
+            errors="backslashreplace",
+            closefd=False,
+        )
+    except (AttributeError, OSError, ValueError):
+        # stderr is not backed by a file (e.g. captured in tests)
+        return sys.stderr
+
+
+class LogQueue:
+    """
+    Routes log records of the service through a queue, so that formatting and writing
+    them (e.g. tracebacks of failed requests) happen in a listener thread and do not
+    block the event loop.
+
+    The queue is bounded (records are dropped when it is full) and by default records are
+    written to a buffered stderr, which is flushed whenever the queue is drained.
+
+    Like EngineFactory, it is context managed by Initializer: records are queued from
+    service startup until shutdown, when the remaining ones are flushed.
+    """
+
+    def __init__(self, handler: Optional[logging.Handler] = None) -> None:
+        self._handler = handler
+        # buffered stderr of the default handler, it is opened for the lifetime of the queue
+        self._stream: Optional[TextIO] = None
+        self._queue: queue.Queue = queue.Queue(_QUEUE_SIZE)
+        self._queue_handler = _DeferredQueueHandler(self._queue)
+        self._listener: Optional[_FlushingQueueListener] = None
+
+    async def __aenter__(self) -> "LogQueue":
+        handler = self._handler
+        if handler is None:
+            self._stream = _buffered_stderr()
+            handler = _BufferedStreamHandler(self._stream)
+            handler.setFormatter(TracebackFormatter())
+
+        self._listener = _FlushingQueueListener(self._queue, handler, respect_handler_level=True)
+        logging.getLogger().addHandler(self._queue_handler)
+        self._listener.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        logging.getLogger().removeHandler(self._queue_handler)
+        if self._listener is not None:
+            # processes all queued records before returning
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.flush()
+            self._listener = None
+
+        if self._stream is not None and self._stream is not sys.stderr:
+            # file descriptor stays open, it is owned by sys.stderr
+            self._stream.close()
+        self._stream = None
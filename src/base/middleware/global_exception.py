@@ -1,26 +1,57 @@
-import traceback
+import logging
 from http import HTTPStatus
 
-from fastapi import Request
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from src.base.exception.api.base import PrebuiltResponse
+
+# Error response is constant, so it is built only once
+_INTERNAL_SERVER_ERROR_RESPONSE = PrebuiltResponse(
+    HTTPStatus.INTERNAL_SERVER_ERROR.value, orjson.dumps({"errors": [HTTPStatus.INTERNAL_SERVER_ERROR.phrase]})
+)
+
+logger = logging.getLogger(__name__)
+
+
+class GlobalExceptionMiddleware:
+    """
+    Pure ASGI middleware that turns unexpected exceptions into JSON error responses.
+    Unlike BaseHTTPMiddleware it does not wrap requests and responses into objects nor
+    bridge them through a task group, so it costs almost nothing on the happy path.
+
+    Expected exceptions (HTTPException, ValueError) are handled by the exception handlers
+    of the app. This middleware is kept for the rest, because Starlette installs handler
+    for `Exception` outside of all middleware (responses would miss e.g. CORS headers)
+    and re-raises the exception after responding.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
-class GlobalExceptionMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
         try:
-            return await call_next(request)
-        
-        except ValueError as err:
-            traceback.print_exception(type(err), err, err.__traceback__)
-            return JSONResponse(
-                status_code=HTTPStatus.BAD_REQUEST.value,
-                content={"errors": [HTTPStatus.BAD_REQUEST.phrase]},
-            )
-        
+            await self.app(scope, receive, send_wrapper)
         except Exception as err:
-            traceback.print_exception(type(err), err, err.__traceback__)
-            return JSONResponse(
-                status_code=HTTPStatus.INTERNAL_SERVER_ERROR.value,
-                content={"errors": [HTTPStatus.INTERNAL_SERVER_ERROR.phrase]},
-            )
+            if response_started:
+                # headers are already sent - nothing we can respond with
+                raise
+            await self._handle(err, scope, receive, send)
+
+    async def _handle(self, err: Exception, scope: Scope, receive: Receive, send: Send) -> None:
+        # error path is kept out of __call__, so the coroutine of every request stays small
+        # traceback is formatted lazily, by the log handler
+        logger.error("unhandled_error", exc_info=err)
+        await _INTERNAL_SERVER_ERROR_RESPONSE(scope, receive, send)
@@ -1,27 +1,44 @@
 from os import environ
 
-from dotenv import load_dotenv
+from dotenv import dotenv_values
+from fastapi import FastAPI
 
 from src.base.app import create_fastapi_app
 from src.base.config import Config
 
 from src.auth.auth_service_initializer import AuthServiceInitializer
-from src.auth.endpoint.main import main_router as router_auth
+from src.auth.endpoint.main import ROUTERS_PREFIX, routers as routers_auth
 from src.auth.doc import Tags
 
-load_dotenv('.env')
-config = Config(environ)
-
-app = create_fastapi_app(
-    config=config,
-    initializer=AuthServiceInitializer,
-    title="Simple Auth Service",
-    description="Simple authentication service",
-    version="0.1.0",
-    team_name="core",
-    team_url="https://invalid-address.ee",
-    openapi_tags=Tags.get_docs(),
-)
-
-# Service routes
-app.include_router(router_auth)
+
+def build_app() -> FastAPI:
+    """
+    Builds the service app. Configuration is read here (once per app), not at import
+    of the module.
+    """
+    # Values from the environment take precedence over the ones from '.env' file. Config is
+    # built once and shared with the initializer, os.environ is left untouched.
+    config = Config({
+        **{name: value for name, value in dotenv_values('.env').items() if value is not None},
+        **environ,
+    })
+
+    app = create_fastapi_app(
+        config=config,
+        initializer=AuthServiceInitializer,
+        title="Simple Auth Service",
+        description="Simple authentication service",
+        version="0.1.0",
+        team_name="core",
+        team_url="https://invalid-address.ee",
+        openapi_tags=Tags.get_docs(),
+    )
+
+    # Service routes
+    for router in routers_auth:
+        app.include_router(router, prefix=ROUTERS_PREFIX)
+
+    return app
+
+
+app = build_app()
@@ -0,0 +1,152 @@
+import base64
+import hmac
+from time import time
+
+import orjson
+import pytest
+
+from src.auth.util.jwt_codec import InvalidTokenError, decode, encode, get_unverified_payload, signing_key
+
+# long enough for HS512, so PyJWT does not warn about the key length
+SECRET = b"0123456789abcdef" * 4
+
+
+def _b64encode(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).rstrip(b"=").decode()
+
+
+@pytest.fixture(params=["HS256", "HS384", "HS512"])
+def algorithm(request):
+    return request.param
+
+
+@pytest.fixture
+def key(algorithm):
+    return signing_key(SECRET, algorithm)
+
+
+@pytest.fixture
+def payload():
+    return {"sub": "42", "exp": int(time()) + 60, "jti": "0123456789abcdef"}
+
+
+def test_round_trip(payload, key, algorithm):
+    token = encode(payload, key, algorithm)
+
+    assert decode(token, key, algorithm) == payload
+    assert get_unverified_payload(token) == payload
+
+
+def test_key_is_reusable(payload, key, algorithm):
+    # each token is signed by a copy of the key, the key itself stays unchanged
+    first = encode(payload, key, algorithm)
+    second = encode(payload, key, algorithm)
+
+    assert first == second
+    assert decode(first, key, algorithm) == payload
+
+
+def test_forged_signature(payload, key, algorithm):
+    token = encode(payload, signing_key(b"other secret", algorithm), algorithm)
+
+    with pytest.raises(InvalidTokenError, match="signature_verification_failed"):
+        decode(token, key, algorithm)
+
+
+def test_tampered_payload(payload, key, algorithm):
+    header, _, signature = encode(payload, key, algorithm).split(".")
+    tampered = _b64encode(orjson.dumps({**payload, "sub": "1"}))
+
+    with pytest.raises(InvalidTokenError, match="signature_verification_failed"):
+        decode(f"{header}.{tampered}.{signature}", key, algorithm)
+
+
+def test_wrong_algorithm(payload):
+    token = encode(payload, signing_key(SECRET, "HS256"), "HS256")
+
+    with pytest.raises(InvalidTokenError, match="algorithm_not_allowed"):
+        decode(token, signing_key(SECRET, "HS512"), "HS512")
+
+
+@pytest.mark.parametrize("header", [
+    {"alg": "none", "typ": "JWT"},
+    {"typ": "JWT", "alg": "HS256"},
+    {"alg": "HS256", "typ": "JWT", "kid": "1"},
+])
+def test_unexpected_header(header, payload):
+    key = signing_key(SECRET, "HS256")
+    signing_input = f"{_b64encode(orjson.dumps(header))}.{_b64encode(orjson.dumps(payload))}"
+    signature = hmac.new(SECRET, signing_input.encode(), "sha256").digest()
+
+    with pytest.raises(InvalidTokenError, match="algorithm_not_allowed"):
+        decode(f"{signing_input}.{_b64encode(signature)}", key, "HS256")
+
+
+@pytest.mark.parametrize("expiry", [0, int(time()) - 1, "never"])
+def test_expired(expiry, payload, key, algorithm):
+    token = encode({**payload, "exp": expiry}, key, algorithm)
+
+    with pytest.raises(InvalidTokenError, match="token_expired"):
+        decode(token, key, algorithm)
+
+
+def test_without_expiry(payload, key, algorithm):
+    del payload["exp"]
+
+    assert decode(encode(payload, key, algorithm), key, algorithm) == payload
+
+
+@pytest.mark.parametrize("spell", [
+    lambda token: token + "=",
+    lambda token: token + "==",
+    lambda token: token + "!!!!",
+    lambda token: token + "\n",
+    lambda token: token.replace(".", ".=", 1),
+    lambda token: token.replace("-", "+").replace("_", "/"),
+    lambda token: token + ".",
+    lambda token: token.rpartition(".")[0],
+])
+def test_non_canonical_spelling(spell, payload, key, algorithm):
+    token = encode(payload, key, algorithm)
+    spelled = spell(token)
+    if spelled == token:
+        pytest.skip("token has no characters to respell")
+
+    with pytest.raises(InvalidTokenError):
+        decode(spelled, key, algorithm)
+
+
+def test_non_canonical_trailing_bits(payload):
+    # last base64 character carries unused bits, setting them does not change the bytes
+    key = signing_key(SECRET, "HS256")
+    token = encode(payload, key, "HS256")
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    last = alphabet.index(token[-1])
+    spelled = token[:-1] + alphabet[last | 0b11]
+
+    assert spelled != token
+    with pytest.raises(InvalidTokenError, match="token_malformed"):
+        decode(spelled, key, "HS256")
+
+
+@pytest.mark.parametrize("token", ["", "garbage", "a.b.c", "a.b.c.d", "é.é.é"])
+def test_malformed(token, key, algorithm):
+    with pytest.raises(InvalidTokenError):
+        decode(token, key, algorithm)
+
+
+def test_payload_must_be_object(key, algorithm):
+    with pytest.raises(InvalidTokenError, match="token_malformed"):
+        decode(encode([1, 2], key, algorithm), key, algorithm)
+
+
+def test_pyjwt_compatibility(payload, key, algorithm):
+    jwt = pytest.importorskip("jwt")
+
+    # tokens issued by PyJWT (before the codec) remain valid and vice versa
+    issued_by_pyjwt = jwt.encode(payload, SECRET.decode(), algorithm=algorithm)
+    issued = encode(payload, key, algorithm)
+
+    assert issued == issued_by_pyjwt
+    assert decode(issued_by_pyjwt, key, algorithm) == payload
+    assert jwt.decode(issued, SECRET.decode(), algorithms=[algorithm]) == payload
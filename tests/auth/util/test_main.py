@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from src.auth.exception.api.account_exception import AccountUnAuthorizedException
+from src.auth.util.jwt_codec import signing_key
+from src.auth.util import main
+from src.auth.util.jwt_settings import JwtSettings
+from src.auth.util.main import authenticate, create_access_token, revoke_access_tokens
+from src.auth.util.token_revocation import TokenRevocationCache
+
+
+class _Redis:
+    """
+    In-memory stand-in for the few Redis commands used by TokenRevocationCache
+    """
+
+    def __init__(self):
+        self.keys = {}
+        self.pipelines = 0
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    async def exists(self, key):
+        return int(key in self.keys)
+
+
+class _Pipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._commands.clear()
+
+    def setex(self, key, expires_in, value):
+        self._commands.append((key, value))
+        return self
+
+    async def execute(self):
+        self._redis.pipelines += 1
+        self._redis.keys.update(self._commands)
+
+
+@pytest.fixture
+def jwt_settings():
+    return JwtSettings(
+        access_signing_key=signing_key(b"access-secret", "HS256"),
+        refresh_signing_key=signing_key(b"refresh-secret", "HS256"),
+        algorithm="HS256",
+    )
+
+
+@pytest.fixture
+def token_revocation_cache():
+    return TokenRevocationCache(_Redis())
+
+
+def _authenticate(token, token_revocation_cache, jwt_settings):
+    return asyncio.run(authenticate(
+        token_revocation_cache=token_revocation_cache, jwt_settings=jwt_settings, token=token
+    ))
+
+
+def test_authenticate(token_revocation_cache, jwt_settings):
+    token = create_access_token(data={"sub": "42"}, jwt_settings=jwt_settings)
+
+    assert _authenticate(token, token_revocation_cache, jwt_settings) == 42
+
+
+def test_authenticate_from_cache(monkeypatch, token_revocation_cache, jwt_settings):
+    token = create_access_token(data={"sub": "42"}, jwt_settings=jwt_settings)
+    _authenticate(token, token_revocation_cache, jwt_settings)
+
+    def decode(*args, **kwargs):
+        raise AssertionError("validated token must not be decoded again")
+
+    monkeypatch.setattr(main, "decode", decode)
+
+    assert _authenticate(token, token_revocation_cache, jwt_settings) == 42
+    # other tokens still go through the decode
+    other_token = create_access_token(data={"sub": "42"}, jwt_settings=jwt_settings)
+    with pytest.raises(AssertionError):
+        _authenticate(other_token, token_revocation_cache, jwt_settings)
+
+
+def test_authenticate_from_cache_checks_denylist(token_revocation_cache, jwt_settings):
+    token = create_access_token(data={"sub": "42"}, jwt_settings=jwt_settings)
+    _authenticate(token, token_revocation_cache, jwt_settings)
+
+    asyncio.run(revoke_access_tokens(access_tokens=[token], token_revocation_cache=token_revocation_cache))
+
+    with pytest.raises(AccountUnAuthorizedException):
+        _authenticate(token, token_revocation_cache, jwt_settings)
+
+
+@pytest.mark.parametrize("suffix", ["", "=", "==", "!!!!", "\n"])
+def test_revoked_token_is_rejected_in_any_spelling(suffix, token_revocation_cache, jwt_settings):
+    token = create_access_token(data={"sub": "42"}, jwt_settings=jwt_settings)
+    _authenticate(token, token_revocation_cache, jwt_settings)
+
+    asyncio.run(revoke_access_tokens(access_tokens=[token], token_revocation_cache=token_revocation_cache))
+
+    with pytest.raises(AccountUnAuthorizedException):
+        _authenticate(token + suffix, token_revocation_cache, jwt_settings)
+
+
+def test_missing_token_is_rejected(token_revocation_cache, jwt_settings):
+    with pytest.raises(AccountUnAuthorizedException):
+        _authenticate(None, token_revocation_cache, jwt_settings)
+
+
+def test_revoke_many_in_pipeline_chunks(token_revocation_cache):
+    tokens = [(f"header.payload.signature{index}", 60) for index in range(1200)]
+    expired = [("header.payload.expired", 0)]
+
+    asyncio.run(token_revocation_cache.revoke_many(tokens + expired))
+
+    assert token_revocation_cache._redis.pipelines == 3
+    assert len(token_revocation_cache._redis.keys) == len(tokens)
+    assert not asyncio.run(token_revocation_cache.is_revoked(token=expired[0][0]))